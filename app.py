@@ -1,9 +1,16 @@
 """
 Riding Club of Barrington Hills - Main Application
 """
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, g, session, has_app_context, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError, SQLAlchemyError
 import os
+import random
+import threading
+from time import monotonic
 from datetime import datetime, date, time
 from dotenv import load_dotenv
 
@@ -29,8 +36,155 @@ else:
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URI', default_db_uri)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Read replicas - comma separated URIs, each registered as a bind named replica_<n>
+replica_uris = [uri.strip() for uri in os.environ.get('DATABASE_REPLICA_URIS', '').split(',') if uri.strip()]
+# Seconds to wait when connecting to a replica before giving up on it
+app.config['REPLICA_CONNECT_TIMEOUT'] = int(os.environ.get('REPLICA_CONNECT_TIMEOUT', 2))
+
+def replica_bind(uri):
+    """Engine options for a replica bind, with a connect timeout where the driver supports one"""
+    # Pre-ping so connections left over from a replica restart are replaced, not used
+    options = {'url': uri, 'pool_pre_ping': True}
+    if uri.startswith('mysql'):
+        options['connect_args'] = {'connect_timeout': app.config['REPLICA_CONNECT_TIMEOUT']}
+    return options
+
+app.config['SQLALCHEMY_BINDS'] = {f'replica_{i}': replica_bind(uri) for i, uri in enumerate(replica_uris)}
+app.config['REPLICA_BINDS'] = list(app.config['SQLALCHEMY_BINDS'])
+# Seconds a client keeps reading from the primary after it writes
+app.config['REPLICA_STICKY_SECONDS'] = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+# Replicas lagging further behind than this are skipped
+app.config['REPLICA_MAX_LAG_SECONDS'] = int(os.environ.get('REPLICA_MAX_LAG_SECONDS', 5))
+# Seconds between replica lag checks
+app.config['REPLICA_LAG_CHECK_INTERVAL'] = int(os.environ.get('REPLICA_LAG_CHECK_INTERVAL', 5))
+
+# Last health result per replica bind: bind key -> (checked_at, healthy)
+replica_status = {}
+# Held while a lag check runs, so concurrent requests do not all probe the replicas
+replica_check_lock = threading.Lock()
+
+def replica_lag(engine):
+    """Return how many seconds a replica is behind the primary, or None if unknown"""
+    with engine.connect() as conn:
+        if engine.dialect.name == 'mysql':
+            try:
+                row = conn.execute(text('SHOW REPLICA STATUS')).mappings().first()
+            except ProgrammingError:
+                # Servers older than MySQL 8.0.22 only know the old statement
+                conn.rollback()
+                row = conn.execute(text('SHOW SLAVE STATUS')).mappings().first()
+            if row is None:
+                return None
+            # MariaDB reports Seconds_Behind_Master from SHOW REPLICA STATUS too
+            return row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+        # Other backends (e.g. a SQLite copy for local testing) only get a liveness check
+        conn.execute(text('SELECT 1'))
+        return 0
+
+def mark_replica(key, healthy, reason=None):
+    """Record a replica's health, logging when it stops or starts being used"""
+    _, was_healthy = replica_status.get(key, (None, None))
+    replica_status[key] = (monotonic(), healthy)
+    if not healthy and was_healthy is not False:
+        app.logger.warning('Read replica %s marked unhealthy, reading from primary: %s', key, reason)
+    elif healthy and was_healthy is False:
+        app.logger.info('Read replica %s is healthy again', key)
+    return healthy
+
+def check_replica(key, engine):
+    """Measure a replica's lag and record whether it is usable"""
+    try:
+        lag = replica_lag(engine)
+    except SQLAlchemyError as exc:
+        return mark_replica(key, False, f'lag check failed: {exc}')
+    if lag is None:
+        return mark_replica(key, False, 'replication is not running')
+    if lag > app.config['REPLICA_MAX_LAG_SECONDS']:
+        return mark_replica(key, False, f'{lag}s behind the primary')
+    return mark_replica(key, True)
+
+def replica_is_healthy(key, engine):
+    """Check a replica's lag, caching the result for REPLICA_LAG_CHECK_INTERVAL"""
+    checked_at, healthy = replica_status.get(key, (None, False))
+    expired = checked_at is None or monotonic() - checked_at >= app.config['REPLICA_LAG_CHECK_INTERVAL']
+    # Only one request runs an expired check; the others keep using the last result
+    if expired and replica_check_lock.acquire(blocking=False):
+        try:
+            healthy = check_replica(key, engine)
+        finally:
+            replica_check_lock.release()
+    return healthy
+
+@event.listens_for(Engine, 'handle_error')
+def mark_failed_replica(context):
+    """Stop reading from a replica as soon as it fails, not only at the next lag check"""
+    if not has_app_context() or context.engine is None:
+        return
+    if not (context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError)):
+        return
+    for key in app.config['REPLICA_BINDS']:
+        if db.engines.get(key) is context.engine:
+            mark_replica(key, False, context.original_exception)
+            if has_request_context() and g.get('read_replica') == key:
+                # Lets retry_read_on_primary run this request again on the primary
+                g.replica_failed = True
+
+def read_replica(engines):
+    """Pick one healthy replica per request, so all of its reads see the same data"""
+    if 'read_replica' not in g:
+        healthy = [key for key in app.config['REPLICA_BINDS'] if replica_is_healthy(key, engines[key])]
+        g.read_replica = random.choice(healthy) if healthy else None
+    return engines[g.read_replica] if g.read_replica else None
+
+def should_read_from_replica():
+    """Only GET/HEAD requests that have not written recently may read from a replica"""
+    if not has_request_context() or request.method not in ('GET', 'HEAD'):
+        return False
+    if g.get('wrote_to_primary') or g.get('replica_failed'):
+        return False
+    return session.get('primary_until', 0) <= datetime.now().timestamp()
+
+class RoutingSession(Session):
+    """Session that sends SELECTs to a healthy replica and everything else to the primary"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and isinstance(clause, Select) and not self._flushing
+                and app.config['REPLICA_BINDS'] and should_read_from_replica()):
+            replica = read_replica(self._db.engines)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+@event.listens_for(RoutingSession, 'after_flush')
+def mark_primary_write(db_session, flush_context):
+    """Keep the rest of this request on the primary once it has written"""
+    if has_request_context():
+        g.wrote_to_primary = True
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def mark_statement_write(orm_execute_state):
+    """Treat statements that are not SELECTs, e.g. a Core update(), as writes"""
+    if has_request_context() and not isinstance(orm_execute_state.statement, Select):
+        g.wrote_to_primary = True
+
+@app.after_request
+def stick_to_primary_after_write(response):
+    """Keep the client on the primary for a while so it reads its own writes"""
+    if app.config['REPLICA_BINDS'] and g.get('wrote_to_primary'):
+        session['primary_until'] = datetime.now().timestamp() + app.config['REPLICA_STICKY_SECONDS']
+    return response
+
+@app.errorhandler(OperationalError)
+def retry_read_on_primary(error):
+    """Run a read again on the primary when its replica fails partway through"""
+    if not g.get('replica_failed'):
+        raise error
+    db.session.rollback()
+    g.read_replica = None
+    return app.dispatch_request()
+
 # Initialize database
-db = SQLAlchemy(app)
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
 
 class Member(db.Model):
     __tablename__ = 'members'
@@ -46,7 +200,7 @@ class CalendarEvent(db.Model):
     __tablename__ = 'calendar_events'
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
-    date = db.Column(db.Date, nullable=False)
+    date = db.Column(db.Date, nullable=False, index=True)
     start_time = db.Column(db.Time, nullable=False)
     end_time = db.Column(db.Time, nullable=False)
     description = db.Column(db.Text, nullable=True)
@@ -92,33 +246,92 @@ def rcbhcalendar():
     """RCBH Calendar page - Google Calendar-like interface"""
     return render_template('rcbhcalendar.html')
 
+# Upper bound on how many months a single events request may span
+MAX_CALENDAR_MONTHS = 12
+
+def add_months(year, month, offset):
+    """Return the (year, month) pair that is `offset` months from year/month"""
+    index = year * 12 + (month - 1) + offset
+    return index // 12, index % 12 + 1
+
+def month_key(year, month):
+    """Key used to group events by month, e.g. '2025-03'"""
+    return f'{year:04d}-{month:02d}'
+
+def serialize_event(event):
+    """Convert a CalendarEvent into its JSON representation"""
+    return {
+        'id': event.id,
+        'title': event.title,
+        'date': event.date.isoformat(),
+        'start_time': event.start_time.strftime('%H:%M'),
+        'end_time': event.end_time.strftime('%H:%M'),
+        'description': event.description
+    }
+
+def events_between(start, end):
+    """Get events with start <= date < end, using the index on date"""
+    return CalendarEvent.query.filter(
+        CalendarEvent.date >= start,
+        CalendarEvent.date < end
+    ).order_by(CalendarEvent.date, CalendarEvent.start_time).all()
+
 @app.route('/api/calendar/events')
 def get_calendar_events():
-    """Get calendar events for a specific month"""
+    """Get calendar events for a month, or a range of months grouped by month"""
     year = request.args.get('year', type=int)
     month = request.args.get('month', type=int)
+    months = request.args.get('months', type=int)
     
     if not year or not month:
         return jsonify({'error': 'Year and month are required'}), 400
+    if not 1 <= month <= 12:
+        return jsonify({'error': 'Month must be between 1 and 12'}), 400
+    if months is not None and not 1 <= months <= MAX_CALENDAR_MONTHS:
+        return jsonify({'error': f'Months must be between 1 and {MAX_CALENDAR_MONTHS}'}), 400
+    
+    # Query the whole span at once as a date range so the index can be used
+    span = months or 1
+    end_year, end_month = add_months(year, month, span)
+    if not date.min.year <= year <= end_year <= date.max.year:
+        return jsonify({'error': f'Dates must be between {date.min.year} and {date.max.year}'}), 400
+    events = events_between(date(year, month, 1), date(end_year, end_month, 1))
     
-    # Get events for the specified month
-    events = CalendarEvent.query.filter(
-        db.extract('year', CalendarEvent.date) == year,
-        db.extract('month', CalendarEvent.date) == month
-    ).all()
+    if months is None:
+        return jsonify([serialize_event(event) for event in events])
     
-    events_data = []
+    # Group by month, keeping empty months so the client can cache them too
+    grouped = {}
+    for offset in range(months):
+        key_year, key_month = add_months(year, month, offset)
+        grouped[month_key(key_year, key_month)] = []
     for event in events:
-        events_data.append({
-            'id': event.id,
-            'title': event.title,
-            'date': event.date.isoformat(),
-            'start_time': event.start_time.strftime('%H:%M'),
-            'end_time': event.end_time.strftime('%H:%M'),
-            'description': event.description
-        })
+        grouped[month_key(event.date.year, event.date.month)].append(serialize_event(event))
+    
+    return jsonify(grouped)
+
+@app.route('/api/calendar/overview')
+def get_calendar_overview():
+    """Get per-day event counts for a year, for the heatmap view"""
+    year = request.args.get('year', type=int)
+    
+    if not year:
+        return jsonify({'error': 'Year is required'}), 400
+    if not date.min.year <= year <= date.max.year:
+        return jsonify({'error': f'Year must be between {date.min.year} and {date.max.year}'}), 400
+    
+    counts = db.session.query(
+        CalendarEvent.date,
+        db.func.count(CalendarEvent.id)
+    ).filter(
+        CalendarEvent.date >= date(year, 1, 1),
+        CalendarEvent.date <= date(year, 12, 31)
+    ).group_by(CalendarEvent.date).all()
     
-    return jsonify(events_data)
+    return jsonify({
+        'year': year,
+        'days': {event_date.isoformat(): count for event_date, count in counts}
+    })
 
 @app.route('/api/calendar/events', methods=['POST'])
 def create_calendar_event():
@@ -143,14 +356,7 @@ def create_calendar_event():
         db.session.add(new_event)
         db.session.commit()
         
-        return jsonify({
-            'id': new_event.id,
-            'title': new_event.title,
-            'date': new_event.date.isoformat(),
-            'start_time': new_event.start_time.strftime('%H:%M'),
-            'end_time': new_event.end_time.strftime('%H:%M'),
-            'description': new_event.description
-        }), 201
+        return jsonify(serialize_event(new_event)), 201
         
     except Exception as e:
         db.session.rollback()
@@ -172,14 +378,7 @@ def update_calendar_event(event_id):
         
         db.session.commit()
         
-        return jsonify({
-            'id': event.id,
-            'title': event.title,
-            'date': event.date.isoformat(),
-            'start_time': event.start_time.strftime('%H:%M'),
-            'end_time': event.end_time.strftime('%H:%M'),
-            'description': event.description
-        })
+        return jsonify(serialize_event(event))
         
     except Exception as e:
         db.session.rollback()
@@ -285,4 +484,7 @@ if __name__ == '__main__':
         from flask_sqlalchemy import SQLAlchemy as _SQLAlchemy  # type: ignore
         db: _SQLAlchemy = app.extensions['sqlalchemy']  # type: ignore
         db.create_all()
+        # create_all skips existing tables, so add any indexes they are missing
+        for index in CalendarEvent.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
     app.run(debug=True)
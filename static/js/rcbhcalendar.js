@@ -10,6 +10,15 @@ class RCBHCalendar {
         this.currentEvent = null;
         this.isEditing = false;
         
+        // LRU cache of events keyed by 'YYYY-MM'; Map keeps insertion order
+        this.monthCache = new Map();
+        this.maxCachedMonths = 12;
+        // Cached months older than this are refetched, so other users' edits show up
+        this.cacheMaxAge = 60 * 1000;
+        this.prefetchRadius = 1;
+        this.prefetchHandle = null;
+        this.cacheGeneration = 0;
+        
         this.initializeEventListeners();
         this.loadCalendar();
     }
@@ -63,23 +72,109 @@ class RCBHCalendar {
     }
 
     async loadEvents() {
+        const year = this.currentDate.getFullYear();
+        const month = this.currentDate.getMonth() + 1;
+        const key = this.monthKey(year, month);
+        
+        let events = this.getCachedMonth(key);
+        if (!events) {
+            // Fetch the surrounding months in the same request
+            const start = new Date(year, month - 1 - this.prefetchRadius, 1);
+            await this.fetchMonths(start.getFullYear(), start.getMonth() + 1, this.prefetchRadius * 2 + 1);
+            events = this.getCachedMonth(key);
+        }
+        
+        this.events = events || [];
+        this.schedulePrefetch();
+    }
+
+    monthKey(year, month) {
+        return `${String(year).padStart(4, '0')}-${String(month).padStart(2, '0')}`;
+    }
+
+    isCached(key) {
+        const entry = this.monthCache.get(key);
+        return entry !== undefined && Date.now() - entry.fetchedAt < this.cacheMaxAge;
+    }
+
+    getCachedMonth(key) {
+        if (!this.isCached(key)) {
+            this.monthCache.delete(key);
+            return null;
+        }
+        
+        // Re-insert so this month becomes the most recently used
+        const entry = this.monthCache.get(key);
+        this.monthCache.delete(key);
+        this.monthCache.set(key, entry);
+        return entry.events;
+    }
+
+    cacheMonth(key, events) {
+        this.monthCache.delete(key);
+        this.monthCache.set(key, { events, fetchedAt: Date.now() });
+        
+        // Evict least recently used months
+        while (this.monthCache.size > this.maxCachedMonths) {
+            this.monthCache.delete(this.monthCache.keys().next().value);
+        }
+    }
+
+    invalidateCache() {
+        // Responses from before a write must not repopulate the cache
+        this.cacheGeneration++;
+        this.monthCache.clear();
+    }
+
+    async fetchMonths(year, month, count) {
+        const generation = this.cacheGeneration;
         try {
-            const year = this.currentDate.getFullYear();
-            const month = this.currentDate.getMonth() + 1;
-            
-            const response = await fetch(`/api/calendar/events?year=${year}&month=${month}`);
+            const response = await fetch(`/api/calendar/events?year=${year}&month=${month}&months=${count}`);
             if (response.ok) {
-                this.events = await response.json();
+                const grouped = await response.json();
+                if (generation !== this.cacheGeneration) return;
+                Object.entries(grouped).forEach(([key, events]) => this.cacheMonth(key, events));
             } else {
                 console.error('Failed to load events');
-                this.events = [];
             }
         } catch (error) {
             console.error('Error loading events:', error);
-            this.events = [];
         }
     }
 
+    schedulePrefetch() {
+        const idle = window.requestIdleCallback || ((callback) => setTimeout(callback, 200));
+        const cancel = window.cancelIdleCallback || clearTimeout;
+        
+        if (this.prefetchHandle !== null) {
+            cancel(this.prefetchHandle);
+        }
+        this.prefetchHandle = idle(() => {
+            this.prefetchHandle = null;
+            this.prefetchAdjacentMonths();
+        });
+    }
+
+    async prefetchAdjacentMonths() {
+        const year = this.currentDate.getFullYear();
+        const month = this.currentDate.getMonth();
+        
+        // Find the smallest span covering every adjacent month not yet cached
+        let first = null;
+        let last = null;
+        for (let offset = -this.prefetchRadius; offset <= this.prefetchRadius; offset++) {
+            const date = new Date(year, month + offset, 1);
+            if (!this.isCached(this.monthKey(date.getFullYear(), date.getMonth() + 1))) {
+                if (first === null) first = offset;
+                last = offset;
+            }
+        }
+        if (first === null) return;
+        
+        const start = new Date(year, month + first, 1);
+        await this.fetchMonths(start.getFullYear(), start.getMonth() + 1, last - first + 1);
+    }
+
     renderCalendar() {
         const year = this.currentDate.getFullYear();
         const month = this.currentDate.getMonth();
@@ -295,6 +390,7 @@ class RCBHCalendar {
             
             if (response.ok) {
                 this.closeEventModal();
+                this.invalidateCache();
                 await this.loadCalendar();
                 this.showNotification('Event saved successfully!', 'success');
             } else {
@@ -407,6 +503,7 @@ class RCBHCalendar {
             if (response.ok) {
                 this.closeEventModal();
                 this.closeEventDetailsModal();
+                this.invalidateCache();
                 await this.loadCalendar();
                 this.showNotification('Event deleted successfully!', 'success');
             } else {
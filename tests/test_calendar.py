@@ -0,0 +1,98 @@
+"""
+Test suite for the calendar events API
+"""
+import pytest
+from datetime import date, time
+from sqlalchemy import create_engine
+from app import app as flask_app, db, CalendarEvent, add_months
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Provide the app inside a context, backed by a temporary SQLite file"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'calendar.db'}")
+    db.metadata.create_all(engine)
+    monkeypatch.setitem(flask_app.config, 'TESTING', True)
+    with flask_app.app_context():
+        monkeypatch.setitem(db.engines, None, engine)
+        yield flask_app
+        db.session.remove()
+    engine.dispose()
+
+@pytest.fixture
+def client(app):
+    """Create a test client for the app"""
+    return app.test_client()
+
+def add_event(title, event_date):
+    """Add an event to the test database"""
+    db.session.add(CalendarEvent(
+        title=title,
+        date=event_date,
+        start_time=time(9, 0),
+        end_time=time(10, 0)
+    ))
+    db.session.commit()
+
+def test_add_months():
+    """Test month arithmetic across year boundaries"""
+    assert add_months(2030, 1, 1) == (2030, 2)
+    assert add_months(2030, 12, 1) == (2031, 1)
+    assert add_months(2030, 1, -1) == (2029, 12)
+
+def test_events_single_month(client):
+    """Test that a single month returns a flat list"""
+    add_event('Trail Ride', date(2030, 5, 3))
+    add_event('June Ride', date(2030, 6, 1))
+    response = client.get('/api/calendar/events?year=2030&month=5')
+    assert response.status_code == 200
+    assert [e['title'] for e in response.get_json()] == ['Trail Ride']
+
+def test_events_multiple_months_grouped(client):
+    """Test that a month range is grouped by month, including empty months"""
+    add_event('December Ride', date(2030, 12, 31))
+    add_event('New Year Ride', date(2031, 1, 1))
+    response = client.get('/api/calendar/events?year=2030&month=11&months=3')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert list(data) == ['2030-11', '2030-12', '2031-01']
+    assert data['2030-11'] == []
+    assert data['2030-12'][0]['title'] == 'December Ride'
+    assert data['2031-01'][0]['title'] == 'New Year Ride'
+
+def test_events_grouped_for_years_before_1000(client):
+    """Test that month keys are zero padded for years below 1000"""
+    add_event('Old Ride', date(999, 1, 5))
+    response = client.get('/api/calendar/events?year=999&month=1&months=1')
+    assert response.status_code == 200
+    assert [e['title'] for e in response.get_json()['0999-01']] == ['Old Ride']
+
+def test_events_months_out_of_range(client):
+    """Test that too many months is rejected"""
+    response = client.get('/api/calendar/events?year=2030&month=1&months=13')
+    assert response.status_code == 400
+
+def test_events_year_out_of_range(client):
+    """Test that spans outside the supported years are rejected"""
+    assert client.get('/api/calendar/events?year=9999&month=12').status_code == 400
+    assert client.get('/api/calendar/events?year=9999&month=11&months=3').status_code == 400
+    assert client.get('/api/calendar/events?year=-1&month=1').status_code == 400
+
+def test_calendar_overview_counts(client):
+    """Test that the year overview returns per-day event counts"""
+    add_event('Morning Ride', date(2030, 7, 4))
+    add_event('Evening Ride', date(2030, 7, 4))
+    add_event('Other Year', date(2031, 7, 4))
+    response = client.get('/api/calendar/overview?year=2030')
+    assert response.status_code == 200
+    assert response.get_json() == {'year': 2030, 'days': {'2030-07-04': 2}}
+
+def test_calendar_overview_requires_year(client):
+    """Test that the year overview requires a year"""
+    response = client.get('/api/calendar/overview')
+    assert response.status_code == 400
+
+def test_calendar_overview_year_range(client):
+    """Test the year overview at the edges of the supported years"""
+    assert client.get('/api/calendar/overview?year=9999').status_code == 200
+    assert client.get('/api/calendar/overview?year=10000').status_code == 400
+    assert client.get('/api/calendar/overview?year=-1').status_code == 400
@@ -0,0 +1,155 @@
+"""
+Test suite for read replica routing, using two SQLite files as primary and replica
+"""
+import pytest
+from datetime import date, time
+from flask import g
+from sqlalchemy import create_engine, select, update
+import app as rcbh_app
+from app import app as flask_app, db, CalendarEvent
+
+def create_replica(path, title):
+    """Create a replica SQLite file holding one event"""
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    insert_event(engine, title)
+    return engine
+
+def insert_event(engine, title):
+    """Insert an event on 2030-05-03 directly into one database"""
+    with engine.begin() as conn:
+        conn.execute(CalendarEvent.__table__.insert().values(
+            title=title,
+            date=date(2030, 5, 3),
+            start_time=time(9, 0),
+            end_time=time(10, 0)
+        ))
+
+def event_titles(client):
+    """Get the titles of the May 2030 events"""
+    response = client.get('/api/calendar/events?year=2030&month=5')
+    assert response.status_code == 200
+    return [event['title'] for event in response.get_json()]
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    """Point the primary and replica_0 binds at separate SQLite files"""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    db.metadata.create_all(primary)
+    db.metadata.create_all(replica)
+
+    # Give each database a different event so responses show which one was read
+    insert_event(primary, 'Primary Ride')
+    insert_event(replica, 'Replica Ride')
+
+    with flask_app.app_context():
+        app_engines = db.engines
+    monkeypatch.setitem(app_engines, None, primary)
+    monkeypatch.setitem(app_engines, 'replica_0', replica)
+    monkeypatch.setitem(flask_app.config, 'REPLICA_BINDS', ['replica_0'])
+    monkeypatch.setattr(rcbh_app, 'replica_status', {})
+    yield app_engines
+    primary.dispose()
+    replica.dispose()
+
+@pytest.fixture
+def client(engines, monkeypatch):
+    """Create a test client for the app"""
+    monkeypatch.setitem(flask_app.config, 'TESTING', True)
+    return flask_app.test_client()
+
+def test_get_reads_from_replica(client):
+    """Test that GET requests read from the replica"""
+    assert event_titles(client) == ['Replica Ride']
+
+def test_reads_own_writes_after_post(client):
+    """Test that a client reads from the primary after it writes"""
+    response = client.post('/api/calendar/events', json={
+        'title': 'New Ride',
+        'date': '2030-05-04',
+        'start_time': '09:00',
+        'end_time': '10:00'
+    })
+    assert response.status_code == 201
+
+    assert event_titles(client) == ['Primary Ride', 'New Ride']
+
+def test_other_clients_still_read_from_replica(client):
+    """Test that sticking to the primary only applies to the client that wrote"""
+    response = client.post('/membership/join', data={
+        'first_name': 'Jane',
+        'last_name': 'Doe',
+        'email': 'jane@example.com',
+        'membership_type': 'individual'
+    })
+    assert response.status_code == 302
+
+    assert event_titles(flask_app.test_client()) == ['Replica Ride']
+    assert event_titles(client) == ['Primary Ride']
+
+def test_primary_used_again_after_sticky_window(client, monkeypatch):
+    """Test that reads go back to the replica once the sticky window has passed"""
+    monkeypatch.setitem(flask_app.config, 'REPLICA_STICKY_SECONDS', -1)
+    response = client.delete('/api/calendar/events/1')
+    assert response.status_code == 200
+    with client.session_transaction() as sess:
+        assert 'primary_until' in sess
+    assert event_titles(client) == ['Replica Ride']
+
+def test_lagging_replica_falls_back_to_primary(client, monkeypatch):
+    """Test that a replica too far behind the primary is skipped"""
+    monkeypatch.setattr(rcbh_app, 'replica_lag', lambda engine: 60)
+    assert event_titles(client) == ['Primary Ride']
+
+def test_unreachable_replica_falls_back_to_primary(client, engines, tmp_path):
+    """Test that a replica that cannot be reached is skipped"""
+    missing = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    engines['replica_0'] = missing
+    assert event_titles(client) == ['Primary Ride']
+    missing.dispose()
+
+def test_replica_failure_falls_back_to_primary(client, engines, tmp_path):
+    """Test that a replica failing between lag checks is retried on the primary and then skipped"""
+    replica_dir = tmp_path / 'replica'
+    replica_dir.mkdir()
+    replica = create_replica(replica_dir / 'replica.db', 'Replica Ride')
+    engines['replica_0'] = replica
+    assert event_titles(client) == ['Replica Ride']
+
+    # Take the replica away before the next lag check is due
+    replica.dispose()
+    replica_dir.rename(tmp_path / 'gone')
+    assert event_titles(client) == ['Primary Ride']
+    assert rcbh_app.replica_status['replica_0'][1] is False
+
+    assert event_titles(client) == ['Primary Ride']
+
+def test_one_replica_per_request(engines, tmp_path, monkeypatch):
+    """Test that every read in a request uses the same replica"""
+    second = create_replica(tmp_path / 'replica_1.db', 'Second Replica Ride')
+    monkeypatch.setitem(engines, 'replica_1', second)
+    monkeypatch.setitem(flask_app.config, 'REPLICA_BINDS', ['replica_0', 'replica_1'])
+
+    with flask_app.test_request_context('/api/calendar/events'):
+        binds = {db.session.get_bind(clause=select(CalendarEvent)) for _ in range(20)}
+        db.session.remove()
+    assert len(binds) == 1
+    assert binds <= {engines['replica_0'], second}
+    second.dispose()
+
+def test_only_selects_go_to_replica(engines):
+    """Test that write statements are sent to the primary, even in a GET request"""
+    with flask_app.test_request_context('/api/calendar/events'):
+        assert db.session.get_bind(clause=select(CalendarEvent)) is engines['replica_0']
+        assert db.session.get_bind(clause=update(CalendarEvent)) is engines[None]
+        db.session.remove()
+
+def test_core_write_reads_from_primary_afterwards(engines):
+    """Test that a Core update counts as a write for read-your-writes"""
+    with flask_app.test_request_context('/api/calendar/events'):
+        db.session.execute(update(CalendarEvent).values(title='Updated Ride'))
+        db.session.commit()
+        assert g.wrote_to_primary
+        assert db.session.scalars(select(CalendarEvent.title)).all() == ['Updated Ride']
+        db.session.remove()